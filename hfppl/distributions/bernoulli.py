@@ -1,6 +1,7 @@
 from .distribution import Distribution
 
 import numpy as np
+import math
 
 class Bernoulli(Distribution):
     """A Bernoulli distribution.
@@ -13,13 +14,15 @@ class Bernoulli(Distribution):
             p: the probability-of-True for the Bernoulli distribution.
         """
         self.p = p
+        self._log_p   = math.log(p) if p > 0 else float('-inf')
+        self._log_1mp = math.log1p(-p) if p < 1 else float('-inf')
 
     async def sample(self):
         b = np.random.rand() < self.p
         return (b, await self.log_prob(b))
 
     async def log_prob(self, value):
-        return np.log(self.p) if value else np.log1p(-self.p)
+        return self._log_p if value else self._log_1mp
     
     async def argmax(self, idx):
         return ((self.p > 0.5) if idx == 0 else (self.p < 0.5))
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .distribution import Distribution
+import numpy as np
+import math
 
 class Geometric(Distribution):
     """A Geometric distribution.
@@ -11,13 +13,32 @@ class Geometric(Distribution):
             p: the rate of the Geometric distribution.
         """
         self.p = p
+        self._log_p   = math.log(p) if p > 0 else float('-inf')
+        self._log_1mp = math.log1p(-p) if p < 1 else float('-inf')
 
     async def sample(self):
         n = np.random.geometric(self.p)
         return n, await self.log_prob(n)
 
     async def log_prob(self, value):
-        return np.log(self.p) + np.log(1 - self.p)*(value - 1)
+        """Compute the log probability of `value`. Also accepts a numpy array of values, in which case
+        an array of log probabilities is returned."""
+        if self.p >= 1:
+            # All mass is on 1; the general formula would give -inf * 0 == nan there.
+            if isinstance(value, np.ndarray):
+                return np.where(value == 1, 0.0, float('-inf'))
+            return 0.0 if value == 1 else float('-inf')
+        return self._log_p + self._log_1mp * (value - 1)
+    
+    async def log_prob_batch(self, values):
+        """Compute the log probabilities of many values at once, e.g. one per particle.
+        
+        Args:
+            values: an array-like of positive integers.
+        
+        Returns:
+            logprobs (np.array): the log probability of each value."""
+        return await self.log_prob(np.asarray(values, dtype=float))
     
     async def argmax(self, idx):
-        return idx - 1 # Most likely outcome is 0, then 1, etc.
\ No newline at end of file
+        return idx - 1 # Most likely outcome is 0, then 1, etc.
@@ -25,7 +25,7 @@ class LMNextToken(Distribution):
         probs = np.exp(self.ctx.next_token_logprobs)
         token_id = np.random.choice(len(probs), p=(probs))
         logprob = self.ctx.next_token_logprobs[token_id]
-        t = Token(self.ctx.lm, token_id, self.ctx.lm.tokenizer.convert_ids_to_tokens(token_id))
+        t = Token(self.ctx.lm, token_id)
         self.ctx.s += t
         self.ctx.model_mask = self.ctx.NO_MASK
         updated_logprobs = await self.ctx.lm.next_token_logprobs(self.ctx.s.seq)
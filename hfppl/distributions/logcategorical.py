@@ -1,7 +1,9 @@
 from .distribution import Distribution
+from ..util import logsumexp, gumbel_noise
+import numpy as np
 
 class LogCategorical(Distribution):
-    """A Geometric distribution."""
+    """A Categorical distribution over integers, parameterized by logits."""
 
     def __init__(self, logits):
         """Create a Categorical distribution from unnormalized log probabilities (logits). 
@@ -11,14 +13,16 @@ class LogCategorical(Distribution):
         Args:
             logits (np.array): a numpy array of unnormalized log probabilities.
         """
-        self.log_probs = log_softmax(logits)
+        self.logits = logits
+        self.lse    = logsumexp(logits)
 
     async def sample(self):
-        n = np.random.choice(len(self.log_probs), p=np.exp(self.log_probs))
+        # Gumbel-max trick: argmax of logits plus Gumbel noise is a sample from softmax(logits)
+        n = int(np.argmax(self.logits + gumbel_noise(np.shape(self.logits))))
         return n, await self.log_prob(n)
 
     async def log_prob(self, value):
-        return self.log_probs[value]
+        return self.logits[value] - self.lse
     
     async def argmax(self, idx):
-        return np.argsort(self.log_probs)[-idx]
\ No newline at end of file
+        return int(np.argpartition(self.logits, -idx)[-idx])
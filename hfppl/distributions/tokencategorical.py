@@ -1,7 +1,16 @@
 from .distribution import Distribution
-from ..util import log_softmax
+from ..util import logsumexp, gumbel_noise
 from ..llms import Token
 import numpy as np
+import torch
+
+# Number of logits processed at a time by `sample_batch`, chosen so that working buffers stay in cache.
+_BLOCK_ELEMENTS = 1 << 18
+
+def _noise_dtype(logits):
+    # float32 noise is precise enough for float32 logits; half-precision (and other) logits are
+    # upcast, since uniforms drawn at their precision would be too coarse.
+    return np.float32 if logits.dtype == np.float32 else np.float64
 
 class TokenCategorical(Distribution):
 
@@ -10,22 +19,94 @@ class TokenCategorical(Distribution):
         Given a language model `lm` and an array of unnormalized log probabilities (of length `len(lm.vocab)`), 
         uses softmax to normalize them and samples a Token from the resulting categorical.
         
+        Log probabilities are computed on demand from the logits and a cached normalizer,
+        rather than materializing a vocabulary-sized array of log probabilities.
+        
         Args:
             lm (hfppl.llms.CachedCausalLM): the language model whose vocabulary is to be generated from.
-            logits (np.array): a numpy array of unnormalized log probabilities.
+            logits (np.array | torch.Tensor): a numpy array of unnormalized log probabilities. A torch tensor may
+              also be given, in which case sampling and scoring happen on the tensor's device.
         """
         self.lm        = lm
-        self.log_probs = log_softmax(logits)
+        self.logits    = logits
+        self.on_device = isinstance(logits, torch.Tensor)
+        self.lse       = torch.logsumexp(logits.float(), dim=-1) if self.on_device else logsumexp(logits)
+        self._top      = None # lazily computed token ids of the most probable tokens, in descending order
         if self.lm.tokenizer.vocab_size != len(logits):
             raise RuntimeError(f"TokenCategorical: vocab size is {self.lm.tokenizer.vocab_size} but provided {len(logits)} logits.")
 
+    @classmethod
+    def sample_batch(cls, lm, logits):
+        """Draw one Token from each row of a matrix of logits, using vectorized operations over blocks of rows.
+        
+        Args:
+            lm (hfppl.llms.CachedCausalLM): the language model whose vocabulary is to be generated from.
+            logits (np.array): a numpy array of shape `(N, len(lm.vocab))`, each row holding unnormalized log probabilities.
+              Unlike the `TokenCategorical` constructor, torch tensors are not supported.
+        
+        Returns:
+            samples (list[tuple[hfppl.llms.Token, float]]): for each row, the sampled Token and its log probability.
+        """
+        if lm.tokenizer.vocab_size != logits.shape[1]:
+            raise RuntimeError(f"TokenCategorical: vocab size is {lm.tokenizer.vocab_size} but provided {logits.shape[1]} logits per row.")
+        # Work at float32 for float32 logits; only lower-precision logits are upcast. Rows are
+        # processed in cache-sized blocks, reusing the noise buffer for the normalizer.
+        dtype     = _noise_dtype(logits)
+        n_rows    = max(1, _BLOCK_ELEMENTS // logits.shape[1])
+        tokens    = np.empty(len(logits), dtype=np.intp)
+        log_probs = np.empty(len(logits), dtype=dtype)
+        for start in range(0, len(logits), n_rows):
+            block  = logits[start:start + n_rows]
+            work   = gumbel_noise(block.shape, dtype)
+            work  += block
+            tok    = np.argmax(work, axis=1)
+            m      = np.max(block, axis=1).astype(dtype)
+            np.subtract(block, m[:, None], out=work)
+            np.exp(work, out=work)
+            lse    = m + np.log(np.sum(work, axis=1))
+            tokens[start:start + n_rows]    = tok
+            log_probs[start:start + n_rows] = block[np.arange(len(tok)), tok] - lse
+        return [(Token(lm, n), lp) for n, lp in zip(tokens.tolist(), log_probs.tolist())]
+
+    def _log_prob_of(self, n):
+        # Half-precision tensor logits are scored in float32, matching the normalizer.
+        if self.on_device:
+            return (self.logits[n].float() - self.lse).item()
+        return self.logits[n] - self.lse
+
     async def sample(self):
-        n = np.random.choice(len(self.log_probs), p=(np.exp(self.log_probs)))
-        return Token(self.lm, n, self.lm.tokenizer.convert_ids_to_tokens(n)), self.log_probs[n]
+        # Gumbel-max trick: argmax of logits plus Gumbel noise is a sample from softmax(logits)
+        if self.on_device:
+            # Noise is generated in float32 even for half-precision logits, whose uniforms would be too coarse.
+            u = torch.rand(self.logits.shape, device=self.logits.device, dtype=torch.float32)
+            u = u.clamp(torch.finfo(torch.float32).tiny, 1.0 - torch.finfo(torch.float32).eps / 2)
+            n = (self.logits.float() - torch.log(-torch.log(u))).argmax(dim=-1).item()
+        else:
+            noise  = gumbel_noise(self.logits.shape, _noise_dtype(self.logits))
+            noise += self.logits
+            n = int(np.argmax(noise))
+        return Token(self.lm, n), self._log_prob_of(n)
 
     async def log_prob(self, value):
-        return self.log_probs[value.token_id]
+        return self._log_prob_of(value.token_id)
     
     async def argmax(self, idx):
-        tok = torch.argsort(self.log_probs)[-idx]
-        return Token(self.lm, tok, self.lm.tokenizer.convert_ids_to_tokens(tok)), self.log_probs[tok]
\ No newline at end of file
+        if self.on_device:
+            if idx < 1:
+                tok = torch.argsort(self.logits)[-idx].item()
+            else:
+                if self._top is None or len(self._top) < idx:
+                    k = min(max(idx, 2 * len(self._top) if self._top is not None else idx), len(self.logits))
+                    self._top = torch.topk(self.logits, k).indices
+                tok = self._top[idx - 1].item()
+        elif idx < 1:
+            tok = int(np.argpartition(self.logits, -idx)[-idx])
+        else:
+            # Partially select (rather than fully sort) the top tokens, growing the cached
+            # selection geometrically so successive beam indices reuse the same work.
+            if self._top is None or len(self._top) < idx:
+                k   = min(max(idx, 2 * len(self._top) if self._top is not None else idx), len(self.logits))
+                top = np.argpartition(self.logits, -k)[-k:]
+                self._top = top[np.argsort(-self.logits[top])]
+            tok = int(self._top[idx - 1])
+        return Token(self.lm, tok), self._log_prob_of(tok)
\ No newline at end of file
@@ -41,8 +41,8 @@ class Transformer(Distribution):
         probs = np.exp(log_probs)
         token_id = np.random.choice(len(probs), p=(probs))
         logprob = log_probs[token_id]
-        return Token(self.lm, token_id, self.lm.tokenizer.convert_ids_to_tokens(token_id)), logprob
+        return Token(self.lm, token_id), logprob
         
 #     def argmax(self, idx):
 #         token_id = np.argsort(self.log_probs)[-idx]
-#         return Token(self.lm, token_id, self.lm.tokenizer.convert_ids_to_tokens(token_id)), log_probs[token_id]
\ No newline at end of file
+#         return Token(self.lm, token_id), log_probs[token_id]
\ No newline at end of file
@@ -1,11 +1,12 @@
 import copy
-from ..util import logsumexp
+from ..util import logsumexp, systematic_resample
+from ..modeling import ParticleArray
 import numpy as np
 import asyncio
 
 async def smc_standard(model, n_particles, ess_threshold=0.5):
     """
-    Standard sequential Monte Carlo algorithm with multinomial resampling.
+    Standard sequential Monte Carlo algorithm with systematic resampling.
     
     Args:
         model (hfppl.modeling.Model): The model to perform inference on.
@@ -16,7 +17,7 @@ async def smc_standard(model, n_particles, ess_threshold=0.5):
         particles (list[hfppl.modeling.Model]): The completed particles after inference.
     """
     particles = [copy.deepcopy(model) for _ in range(n_particles)]
-    weights = [0.0 for _ in range(n_particles)]
+    array = ParticleArray(particles)
     
     while (any(map(lambda p: not p.done_stepping(), particles))):
         # Step each particle
@@ -24,18 +25,12 @@ async def smc_standard(model, n_particles, ess_threshold=0.5):
             p.untwist()
         await asyncio.gather(*[p.step() for p in particles if not p.done_stepping()])
         
-        # Normalize weights
-        W = np.array([p.weight for p in particles])
-        w_sum = logsumexp(W)
-        normalized_weights = W - w_sum
-        
-        # Resample if necessary
-        if -logsumexp(normalized_weights * 2) < np.log(ess_threshold) + np.log(n_particles):
-            # Alternative implementation uses a multinomial distribution and only makes n-1 copies, reusing existing one, but fine for now
-            probs = np.exp(normalized_weights)
-            particles = [copy.deepcopy(particles[np.random.choice(range(len(particles)), p=probs)]) for _ in range(n_particles)]
-            avg_weight = w_sum - np.log(n_particles)
-            for p in particles:
-                p.weight = avg_weight
+        # Resample if the effective sample size is too small
+        array.gather()
+        if array.ess() < ess_threshold * n_particles:
+            w_sum = logsumexp(array.weights)
+            particles = [copy.deepcopy(particles[i]) for i in systematic_resample(array.weights)]
+            array = ParticleArray(particles)
+            array.set_weights(w_sum - np.log(n_particles))
         
     return particles
\ No newline at end of file
@@ -3,6 +3,7 @@
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
 import asyncio
+import functools
 
 class TokenSequence:
     """A sequence of tokens.
@@ -74,12 +75,25 @@ class Token:
     Attributes:
         lm (hfppl.llms.CachedCausalLM): the language model for which this is a Token.
         token_id (int): the integer token id (an index into the vocabulary).
-        token_str (str): a string, which the token represents—equal to `lm.vocab[token_id]`."""
+        token_str (str): a string, which the token represents—equal to `lm.vocab[token_id]`. If not given
+            at construction, it is looked up lazily (via `lm.id_to_token`) on first access."""
     
-    def __init__(self, lm, token_id, token_str):
-        self.lm        = lm
-        self.token_id  = token_id
-        self.token_str = token_str
+    __slots__ = ('lm', 'token_id', '_token_str')
+    
+    def __init__(self, lm, token_id, token_str=None):
+        self.lm         = lm
+        self.token_id   = token_id
+        self._token_str = token_str
+    
+    @property
+    def token_str(self):
+        if self._token_str is None:
+            self._token_str = self.lm.id_to_token(self.token_id)
+        return self._token_str
+    
+    @token_str.setter
+    def token_str(self, value):
+        self._token_str = value
     
     # Adding tokens
     def __add__(self, other):
@@ -250,6 +264,20 @@ class CachedCausalLM:
         self.batch_size = batch_size
         self.timeout = 0.02
         self.timer = None
+        
+        # Memoized token id -> token string lookups, to avoid repeated tokenizer calls while sampling.
+        self._id_to_token = functools.lru_cache(maxsize=None)(self.tokenizer.convert_ids_to_tokens)
+    
+    def id_to_token(self, token_id):
+        """Return the tokenizer's string for a token id (as given by `tokenizer.convert_ids_to_tokens`), with caching.
+        
+        Args:
+            token_id (int): the token id to look up.
+        
+        Returns:
+            token_str (str): the token string.
+        """
+        return self._id_to_token(int(token_id))
     
     def __deepcopy__(self, memo):
         return self
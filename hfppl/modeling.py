@@ -1,4 +1,33 @@
 import copy
+import numpy as np
+import torch
+from .util import logsumexp
+
+_NEG_INF = float('-inf')
+
+def _is_tensor_tree(v):
+    # Only exact list/tuple/dict containers are handled here; subclasses (namedtuples, OrderedDicts,
+    # HuggingFace ModelOutputs, ...) are left to copy.deepcopy, which preserves their type.
+    if isinstance(v, torch.Tensor):
+        return True
+    if type(v) in (list, tuple):
+        return len(v) > 0 and all(_is_tensor_tree(x) for x in v)
+    if type(v) is dict:
+        return len(v) > 0 and all(_is_tensor_tree(x) for x in v.values())
+    return False
+
+def _clone_tensor_tree(v, memo):
+    if isinstance(v, torch.Tensor):
+        cpy = memo.get(id(v))
+        if cpy is None:
+            cpy = v.detach().clone()
+            memo[id(v)] = cpy
+        return cpy
+    if isinstance(v, list):
+        return [_clone_tensor_tree(x, memo) for x in v]
+    if isinstance(v, tuple):
+        return tuple(_clone_tensor_tree(x, memo) for x in v)
+    return {k: _clone_tensor_tree(x, memo) for k, x in v.items()}
 
 class Model:
     """Base class for all LLaMPPL models.
@@ -7,6 +36,13 @@ class Model:
     that calls `super().__init__(self)`, and a `step` method.
     """
     
+    # The bookkeeping attributes every particle carries are stored in slots; `__dict__` is kept
+    # so that subclasses can add their own attributes without declaring slots.
+    _state_slots = ('weight', 'finished', 'mode', 'beam_idx', 'force_eos', 'twist_amount')
+    __slots__ = (*_state_slots, '__dict__', '__weakref__')
+    
+    _immutable_cache = None
+    
     def __init__(self):
         self.weight = 0.0
         self.finished = False
@@ -26,21 +62,53 @@ class Model:
     def immutable_properties(self):
         """Return a `set[str]` of properties that LLaMPPL may assume do not change during execution of `step`.
         This set is empty by default but can be overridden by subclasses to speed up inference.
+        The result is computed once per class and cached, so it should not depend on instance state.
         
         Returns:
             properties (set[str]): a set of immutable property names"""
         return set()
     
-    def __deepcopy__(self, memo):        
+    def _immutable_property_set(self):
+        immutable = type(self).__dict__.get('_immutable_cache')
+        if immutable is None:
+            immutable = frozenset(self.immutable_properties())
+            type(self)._immutable_cache = immutable
+        return immutable
+    
+    def __getstate__(self):
+        # Used for pickling only; copy.deepcopy goes through __deepcopy__ below.
+        slots = {k: getattr(self, k) for k in Model._state_slots if hasattr(self, k)}
+        return slots, self.__dict__
+    
+    def __setstate__(self, state):
+        slots, attrs = state
+        for k, v in slots.items():
+            setattr(self, k, v)
+        self.__dict__.update(attrs)
+    
+    def __deepcopy__(self, memo):
         cpy = type(self).__new__(type(self))
-        immutable = self.immutable_properties()
+        memo[id(self)] = cpy
         
+        # Slot attributes hold immutable scalars, so they are copied by reference.
+        cpy.weight       = self.weight
+        cpy.finished     = self.finished
+        cpy.mode         = self.mode
+        cpy.beam_idx     = self.beam_idx
+        cpy.force_eos    = self.force_eos
+        cpy.twist_amount = self.twist_amount
+        
+        # Immutable properties are aliased; tensors (and lists, tuples, or dicts of tensors) are
+        # cloned directly; everything else is deep-copied.
+        immutable = self._immutable_property_set()
+        attrs     = cpy.__dict__
         for k, v in self.__dict__.items():
             if k in immutable:
-                setattr(cpy, k, v)
+                attrs[k] = v
+            elif _is_tensor_tree(v):
+                attrs[k] = _clone_tensor_tree(v, memo)
             else:
-                setattr(cpy, k, copy.deepcopy(v, memo))
-                
+                attrs[k] = copy.deepcopy(v, memo)
         return cpy
 
     
@@ -53,11 +121,14 @@ class Model:
         Args:
             amt: the logarithm of the amount by which to (temporarily) multiply this particle's weight.
         """
+        if self.weight == _NEG_INF:
+            return
         self.twist_amount += amt
         self.score(amt)
         
     def untwist(self):
-        self.score(-self.twist_amount)
+        if self.weight != _NEG_INF:
+            self.score(-self.twist_amount)
         self.twist_amount = 0.0
         
     def finish(self):
@@ -91,6 +162,9 @@ class Model:
         Args:
             score: logarithm of the amount by which the particle's weight should be multiplied.
         """
+        # A particle with zero weight stays at zero weight; skip the arithmetic.
+        if self.weight == _NEG_INF:
+            return
         self.weight += score
 
     def condition(self, b):
@@ -173,11 +247,61 @@ class Model:
         #         self.score(w)
         #     return x
         
-        if proposal is None:
+        # When the proposal is the target itself, the importance weight p(x) / q(x) is exactly 1,
+        # so there is no need to re-score the sampled value.
+        if proposal is None or proposal is dist:
             x, _ = await dist.sample()
             return x
         else:
             x, q = await proposal.sample()
             p = await dist.log_prob(x)
             self.score(p - q)
-            return x
\ No newline at end of file
+            return x
+
+
+class ParticleArray:
+    """Structure-of-arrays view of the log weights of a list of particles.
+    
+    The weights are gathered into a numpy array in a single pass (on construction and on each call
+    to `gather`), so inference algorithms can compute normalized weights, effective sample sizes,
+    and resampling indices with vectorized numpy operations instead of looping over particles.
+    
+    Attributes:
+        particles (list[hfppl.modeling.Model]): the particles.
+        weights (numpy.array): the log weight of each particle, as of the last `gather`.
+    """
+    
+    def __init__(self, particles):
+        """Create a `ParticleArray` for the given particles.
+        
+        Args:
+            particles (list[hfppl.modeling.Model]): the particles.
+        """
+        self.particles = particles
+        self.gather()
+    
+    def __len__(self):
+        return len(self.particles)
+    
+    def gather(self):
+        """Refresh `weights` from the particles' current `weight` attributes."""
+        self.weights = np.fromiter((p.weight for p in self.particles), dtype=float, count=len(self.particles))
+    
+    def set_weights(self, weights):
+        """Overwrite the log weight of every particle.
+        
+        Args:
+            weights (float | numpy.array): a single log weight for all particles, or one per particle.
+        """
+        self.weights = np.broadcast_to(np.asarray(weights, dtype=float), (len(self.particles),)).copy()
+        for p, w in zip(self.particles, self.weights.tolist()):
+            p.weight = w
+    
+    def normalized_weights(self):
+        """Return the particles' log weights, normalized to sum (in probability space) to one."""
+        return self.weights - logsumexp(self.weights)
+    
+    def ess(self):
+        """Return the effective sample size, `1 / sum(w**2)` for the normalized weights `w`."""
+        w = np.exp(self.normalized_weights())
+        return 1.0 / np.sum(w ** 2)
@@ -18,4 +18,49 @@ def log_softmax(nums):
     return nums - logsumexp(nums)
 
 def softmax(nums):
-    return np.exp(log_softmax(nums))
\ No newline at end of file
+    return np.exp(log_softmax(nums))
+
+def gumbel_noise(shape, dtype=np.float64):
+    """Draw standard Gumbel noise, for sampling from `softmax(logits)` as `argmax(logits + noise)`.
+    
+    The underlying uniforms are clipped to the open interval (0, 1), so the noise is always finite.
+    They are drawn by a `numpy.random.Generator` seeded from the global numpy random state, which
+    is faster than `np.random.random_sample` and draws float32 directly, while keeping results
+    reproducible under `np.random.seed`.
+    
+    Args:
+        shape: the shape of the array of noise to draw.
+        dtype: the floating-point precision of the noise, either `np.float32` or `np.float64`.
+    
+    Returns:
+        np.array: an array of Gumbel noise of the given shape and dtype.
+    """
+    finfo = np.finfo(dtype)
+    rng   = np.random.default_rng(np.random.randint(np.iinfo(np.int64).max, dtype=np.int64))
+    u     = rng.random(shape, dtype=finfo.dtype)
+    np.clip(u, finfo.tiny, finfo.dtype.type(1) - finfo.epsneg, out=u)
+    np.log(u, out=u)
+    np.negative(u, out=u)
+    np.log(u, out=u)
+    np.negative(u, out=u)
+    return u
+
+def systematic_resample(log_weights, n=None):
+    """Draw ancestor indices by systematic resampling.
+    
+    A single uniform offset is shared by `n` evenly spaced points, which are located in the
+    cumulative distribution of the normalized weights. This has lower variance than
+    independent multinomial draws and runs in O(n) vectorized numpy operations.
+    
+    Args:
+        log_weights: a numpy array of unnormalized log weights.
+        n (int): number of indices to draw. Defaults to `len(log_weights)`.
+    
+    Returns:
+        np.array: an integer array of `n` indices into `log_weights`.
+    """
+    if n is None:
+        n = len(log_weights)
+    cumulative = np.cumsum(np.exp(log_weights - logsumexp(log_weights)))
+    u = (np.arange(n) + np.random.random()) / n
+    return np.minimum(np.searchsorted(cumulative, u), len(log_weights) - 1)
@@ -0,0 +1,18 @@
+import asyncio
+import numpy as np
+
+from hfppl.distributions import Geometric
+
+def test_p_one_puts_all_mass_on_one():
+    dist = Geometric(1.0)
+    value, log_prob = asyncio.run(dist.sample())
+    assert value == 1
+    assert log_prob == 0.0
+    assert asyncio.run(dist.log_prob(2)) == float('-inf')
+    assert asyncio.run(dist.log_prob_batch([1, 2, 3])).tolist() == [0.0, float('-inf'), float('-inf')]
+
+def test_log_prob_batch_matches_log_prob():
+    dist = Geometric(0.3)
+    values = [1, 2, 5]
+    expected = [asyncio.run(dist.log_prob(v)) for v in values]
+    assert np.allclose(asyncio.run(dist.log_prob_batch(values)), expected)
@@ -0,0 +1,104 @@
+import copy
+from collections import namedtuple
+
+import numpy as np
+import torch
+
+from hfppl.modeling import Model, ParticleArray
+
+class Counter(Model):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    async def step(self):
+        self.count += 1
+
+def test_particle_array_gathers_weights():
+    particles = [Counter() for _ in range(3)]
+    array = ParticleArray(particles)
+
+    particles[0].score(-1.0)
+    particles[1].weight = -2.0
+    particles[2].score(-3.0)
+    particles[2].reset()
+    array.gather()
+    assert array.weights.tolist() == [-1.0, -2.0, 0.0]
+
+    array.set_weights(-5.0)
+    assert [p.weight for p in particles] == [-5.0, -5.0, -5.0]
+    assert array.weights.tolist() == [-5.0, -5.0, -5.0]
+
+def test_particle_array_ess():
+    particles = [Counter() for _ in range(4)]
+    array = ParticleArray(particles)
+    assert np.isclose(array.ess(), 4.0)
+
+    particles[0].score(float('-inf'))
+    particles[1].score(float('-inf'))
+    array.gather()
+    assert np.isclose(array.ess(), 2.0)
+    assert np.allclose(np.exp(array.normalized_weights()), [0.0, 0.0, 0.5, 0.5])
+
+class Pickleable(Counter):
+    def __getstate__(self):
+        return {"count": self.count}
+
+    def __setstate__(self, state):
+        self.count = state["count"]
+
+def test_deepcopy_ignores_subclass_getstate():
+    model = Pickleable()
+    model.count = 4
+    model.score(-1.0)
+
+    clone = copy.deepcopy(model)
+    assert clone.count == 4
+    assert clone.weight == -1.0
+
+def test_condition_false_clears_twist():
+    model = Counter()
+    model.twist(2.0)
+    model.condition(False)
+    assert model.weight == float('-inf')
+    assert model.twist_amount == 0.0
+    assert model.finished
+
+Pair = namedtuple("Pair", ["key", "value"])
+
+class TensorModel(Model):
+    def __init__(self):
+        super().__init__()
+        self.state = torch.zeros(3)
+        self.alias = self.state
+        self.past = ((torch.ones(2), torch.ones(2)), (torch.ones(2), torch.ones(2)))
+        self.named = Pair(torch.ones(2), torch.ones(2))
+        self.frozen = torch.ones(4)
+
+    def immutable_properties(self):
+        return {"frozen"}
+
+def test_deepcopy_clones_tensors_independently():
+    model = TensorModel()
+    clone = copy.deepcopy(model)
+
+    clone.state += 1
+    clone.past[1][0].add_(1)
+    assert model.state.tolist() == [0.0, 0.0, 0.0]
+    assert model.past[1][0].tolist() == [1.0, 1.0]
+
+def test_deepcopy_preserves_tensor_aliasing():
+    model = TensorModel()
+    clone = copy.deepcopy(model)
+
+    assert clone.alias is clone.state
+    assert clone.state is not model.state
+    assert clone.frozen is model.frozen
+
+def test_deepcopy_preserves_container_types():
+    model = TensorModel()
+    clone = copy.deepcopy(model)
+
+    assert type(clone.past) is tuple and type(clone.past[0]) is tuple
+    assert type(clone.named) is Pair
+    assert clone.named.key is not model.named.key
@@ -0,0 +1,79 @@
+import asyncio
+import numpy as np
+import pytest
+import torch
+
+from hfppl.distributions import TokenCategorical
+from hfppl.util import log_softmax
+
+class FakeTokenizer:
+    def __init__(self, vocab_size):
+        self.vocab_size = vocab_size
+
+class FakeLM:
+    def __init__(self, vocab_size):
+        self.tokenizer = FakeTokenizer(vocab_size)
+
+    def id_to_token(self, token_id):
+        return str(token_id)
+
+class FakeToken:
+    def __init__(self, token_id):
+        self.token_id = token_id
+
+@pytest.mark.parametrize("dtype", [np.float16, np.float32])
+def test_sample_peaked_low_precision_returns_mode(dtype):
+    vocab_size, mode = 32000, 1234
+    logits = np.full(vocab_size, -40.0, dtype=dtype)
+    logits[mode] = 0.0
+    dist = TokenCategorical(FakeLM(vocab_size), logits)
+
+    for _ in range(200):
+        token, _ = asyncio.run(dist.sample())
+        assert token.token_id == mode
+
+@pytest.mark.parametrize("dtype", [np.float16, np.float32])
+def test_sample_batch_peaked_low_precision_returns_mode(dtype):
+    vocab_size, modes = 32000, [3, 1234, 31999]
+    logits = np.full((len(modes), vocab_size), -40.0, dtype=dtype)
+    logits[np.arange(len(modes)), modes] = 0.0
+
+    for _ in range(50):
+        samples = TokenCategorical.sample_batch(FakeLM(vocab_size), logits)
+        assert [token.token_id for token, _ in samples] == modes
+
+def test_sample_batch_checks_vocab_size():
+    with pytest.raises(RuntimeError):
+        TokenCategorical.sample_batch(FakeLM(10), np.zeros((2, 11)))
+
+@pytest.mark.parametrize("dtype", ["float16", "bfloat16", "float32"])
+def test_sample_peaked_tensor_returns_mode(dtype):
+    vocab_size, mode = 32000, 1234
+    logits = torch.full((vocab_size,), -40.0, dtype=getattr(torch, dtype))
+    logits[mode] = 0.0
+    dist = TokenCategorical(FakeLM(vocab_size), logits)
+
+    for _ in range(200):
+        token, _ = asyncio.run(dist.sample())
+        assert token.token_id == mode
+
+@pytest.mark.parametrize("dtype", [np.float16, np.float32, np.float64])
+def test_sample_batch_log_probs_match_log_softmax(dtype):
+    vocab_size = 5000
+    logits = (np.random.randn(8, vocab_size) * 3).astype(dtype)
+
+    samples = TokenCategorical.sample_batch(FakeLM(vocab_size), logits)
+    for row, (token, log_prob) in zip(logits, samples):
+        expected = log_softmax(row.astype(np.float64))[token.token_id]
+        assert log_prob == pytest.approx(expected, abs=1e-4)
+
+@pytest.mark.parametrize("dtype", ["float16", "bfloat16", "float32"])
+def test_tensor_log_prob_matches_float64_reference(dtype):
+    vocab_size = 32000
+    logits = (torch.randn(vocab_size) * 3).to(getattr(torch, dtype))
+    dist = TokenCategorical(FakeLM(vocab_size), logits)
+    reference = torch.log_softmax(logits.double(), dim=-1)
+
+    for token_id in [0, int(logits.argmax()), 12345, vocab_size - 1]:
+        log_prob = asyncio.run(dist.log_prob(FakeToken(token_id)))
+        assert log_prob == pytest.approx(reference[token_id].item(), abs=1e-4)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from hfppl import util
+from hfppl.util import gumbel_noise, systematic_resample
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("u", [0.0, 1.0 - 1e-17])
+def test_gumbel_noise_is_finite_at_uniform_endpoints(monkeypatch, dtype, u):
+    class ConstantGenerator:
+        def random(self, shape, dtype):
+            return np.full(shape, u, dtype=dtype)
+
+    monkeypatch.setattr(np.random, "default_rng", lambda seed: ConstantGenerator())
+    noise = gumbel_noise((8,), dtype)
+    assert noise.dtype == dtype
+    assert np.all(np.isfinite(noise))
+
+def test_gumbel_noise_reproducible_under_global_seed():
+    np.random.seed(0)
+    a = gumbel_noise((16,), np.float32)
+    np.random.seed(0)
+    b = gumbel_noise((16,), np.float32)
+    assert np.array_equal(a, b)
+
+def test_systematic_resample_index_distribution():
+    weights = np.array([0.1, 0.2, 0.3, 0.4])
+    n = 1000
+    indices = systematic_resample(np.log(weights), n)
+    assert indices.shape == (n,)
+    # Systematic resampling gives each index floor(n*w) or ceil(n*w) copies, in sorted order.
+    counts = np.bincount(indices, minlength=len(weights))
+    assert np.all(np.abs(counts - n * weights) <= 1)
+    assert np.all(np.diff(indices) >= 0)
+
+def test_systematic_resample_skips_zero_weights():
+    log_weights = np.array([float('-inf'), np.log(0.5), float('-inf'), np.log(0.5)])
+    indices = systematic_resample(log_weights)
+    assert set(indices.tolist()) <= {1, 3}
+
+def test_systematic_resample_clamps_top_of_cdf(monkeypatch):
+    # Rounding can leave the cumulative weights ending just below 1; the largest
+    # offset must still map to the last particle rather than out of bounds.
+    exact = util.logsumexp
+    monkeypatch.setattr(util, "logsumexp", lambda nums: exact(nums) + 1e-6)
+    monkeypatch.setattr(np.random, "random", lambda: 1.0 - 1e-12)
+    indices = systematic_resample(np.zeros(3))
+    assert indices.tolist() == [1, 2, 2]